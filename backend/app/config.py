@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,13 +20,19 @@ class Config:
     LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-3.5-turbo')
     LLM_TEMPERATURE = float(os.getenv('LLM_TEMPERATURE', '0.4'))
     MAX_FOLLOWUPS = int(os.getenv('MAX_FOLLOWUPS', '2'))
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '16'))
+    LLM_KEEPALIVE_EXPIRY = float(os.getenv('LLM_KEEPALIVE_EXPIRY', '120'))  # seconds an idle API connection is kept
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '60'))  # seconds an LLM request may take
     
     # Interview settings
     QUESTIONS_PER_SESSION = int(os.getenv('QUESTIONS_PER_SESSION', '5'))
     SESSION_TIMEOUT = int(os.getenv('SESSION_TIMEOUT', '1800'))  # 30 minutes
+    HISTORY_WINDOW = int(os.getenv('HISTORY_WINDOW', '40'))  # conversation turns kept per session
+    SESSION_FLUSH_INTERVAL = float(os.getenv('SESSION_FLUSH_INTERVAL', '5'))  # seconds between write-behind flushes
     
     # WebSocket settings
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
+    WS_MAX_MESSAGE_BYTES = int(os.getenv('WS_MAX_MESSAGE_BYTES', '65536'))  # largest inbound frame accepted
     
     # Server settings
     HOST = os.getenv('HOST', '0.0.0.0')
@@ -42,13 +49,20 @@ class Config:
             'DATABASE_URL': cls.DATABASE_URL,
             'LLM_TEMPERATURE': cls.LLM_TEMPERATURE,
             'MAX_FOLLOWUPS': cls.MAX_FOLLOWUPS,
+            'LLM_MAX_CONCURRENCY': cls.LLM_MAX_CONCURRENCY,
+            'LLM_KEEPALIVE_EXPIRY': cls.LLM_KEEPALIVE_EXPIRY,
+            'LLM_TIMEOUT': cls.LLM_TIMEOUT,
             'QUESTIONS_PER_SESSION': cls.QUESTIONS_PER_SESSION,
             'SESSION_TIMEOUT': cls.SESSION_TIMEOUT,
+            'HISTORY_WINDOW': cls.HISTORY_WINDOW,
+            'SESSION_FLUSH_INTERVAL': cls.SESSION_FLUSH_INTERVAL,
+            'WS_MAX_MESSAGE_BYTES': cls.WS_MAX_MESSAGE_BYTES,
             'DEBUG': cls.DEBUG,
             'HOST': cls.HOST,
             'PORT': cls.PORT,
         }
 
+@lru_cache(maxsize=1)
 def get_config():
-    """Legacy function for backward compatibility"""
+    """Legacy function for backward compatibility (cached; env is read once at import)"""
     return Config.get_config()
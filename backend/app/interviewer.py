@@ -1,76 +1,153 @@
+from collections import OrderedDict, deque
+from contextlib import aclosing
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from itertools import islice
+from types import MappingProxyType
+import asyncio
+import logging
 import random
-import json
 import os
-from .llm_wrappers import create_chain, run_chain, parse_analysis
+import pickle
+import orjson
+from .llm_wrappers import (
+    create_chain, run_chain, stream_chain, parse_analysis, fallback_scoring
+)
 from .config import get_config
 
-class LLMPoweredInterviewer:
-    def __init__(self):
-        self.config = get_config()
-        
-        self.reset_interview()
-        
-        self.questions = [
-            {
-                "id": 1,
-                "question": "What's the difference between arrays and linked lists? When would you use each?",
-                "key_concepts": "arrays, linked lists, time complexity, memory access, use cases",
-                "difficulty": "medium",
-                "follow_ups": [
-                    "Can you explain the time complexity of insertions in both?",
-                    "How does cache performance differ between arrays and linked lists?",
-                    "When would you prefer a linked list over an array for dynamic data?"
-                ]
-            },
-            {
-                "id": 2,
-                "question": "How would you detect a cycle in a linked list?",
-                "key_concepts": "cycle detection, Floyd's algorithm, two pointers, time complexity",
-                "difficulty": "medium",
-                "follow_ups": [
-                    "Can you describe Floyd's tortoise and hare algorithm in detail?",
-                    "What is the time and space complexity of your approach?",
-                    "How would you find the start of the cycle?"
-                ]
-            },
-            {
-                "id": 3,
-                "question": "Explain binary search and its time complexity.",
-                "key_concepts": "binary search, sorted array, O(log n), divide and conquer",
-                "difficulty": "easy",
-                "follow_ups": [
-                    "What happens if the array is not sorted?",
-                    "Can you implement binary search recursively?",
-                    "How does binary search handle duplicate elements?"
-                ]
-            },
-            {
-                "id": 4,
-                "question": "What is dynamic programming? Give an example.",
-                "key_concepts": "dynamic programming, memoization, overlapping subproblems, optimization",
-                "difficulty": "hard",
-                "follow_ups": [
-                    "What's the difference between memoization and tabulation?",
-                    "Can you provide a code example for a dynamic programming problem?",
-                    "When would dynamic programming be inefficient?"
-                ]
-            },
-            {
-                "id": 5,
-                "question": "Explain how hash tables work and handle collisions.",
-                "key_concepts": "hash tables, hash functions, collision resolution, chaining, open addressing",
-                "difficulty": "medium",
-                "follow_ups": [
-                    "What makes a good hash function?",
-                    "How does chaining compare to open addressing for collision resolution?",
-                    "How does load factor affect hash table performance?"
-                ]
-            }
-        ]
-        
-        self.analysis_prompt_template = """
-You are a senior software engineer evaluating a DSA interview answer. Analyze the response for technical accuracy, depth, and coverage of key concepts. Be precise and focus on the data structures and algorithms context.
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+SESSION_EXT = '.pkl'
+LEGACY_SESSION_EXT = '.json'  # read-only, for sessions saved before the pickle format
+SESSION_LOG_EXT = '.log'
+LOG_COMPACT_RECORDS = 8  # delta records appended before the next save rewrites the snapshot
+SUMMARY_TURN_CHARS = 400  # longest message quoted into the end-of-interview summary prompt
+
+
+def session_file_path(session_id):
+    """Return the on-disk path of a saved session, preferring pickle over legacy JSON"""
+    for ext in (SESSION_EXT, LEGACY_SESSION_EXT):
+        file_path = os.path.join(DATA_DIR, f'{session_id}{ext}')
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+
+def session_log_path(session_id):
+    """Return the path of a session's append-only delta log"""
+    return os.path.join(DATA_DIR, f'{session_id}{SESSION_LOG_EXT}')
+
+
+def truncate_text(text, limit=SUMMARY_TURN_CHARS):
+    """Shorten text to at most limit characters, marking the cut with an ellipsis"""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+@dataclass(slots=True)
+class TurnRecord:
+    """One answered question or follow-up in performance_data"""
+    question_id: int
+    question: str
+    answer: str
+    analysis: dict
+    feedback: str
+    is_followup: bool
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    
+    def to_dict(self):
+        """Render for state responses and session files"""
+        return asdict(self)
+
+# Shared by every session, so each definition is a read-only view with tuple follow-ups
+QUESTIONS = tuple(MappingProxyType(q) for q in (
+    {
+        "id": 1,
+        "question": "What's the difference between arrays and linked lists? When would you use each?",
+        "key_concepts": "arrays, linked lists, time complexity, memory access, use cases",
+        "difficulty": "medium",
+        "follow_ups": (
+            "Can you explain the time complexity of insertions in both?",
+            "How does cache performance differ between arrays and linked lists?",
+            "When would you prefer a linked list over an array for dynamic data?"
+        )
+    },
+    {
+        "id": 2,
+        "question": "How would you detect a cycle in a linked list?",
+        "key_concepts": "cycle detection, Floyd's algorithm, two pointers, time complexity",
+        "difficulty": "medium",
+        "follow_ups": (
+            "Can you describe Floyd's tortoise and hare algorithm in detail?",
+            "What is the time and space complexity of your approach?",
+            "How would you find the start of the cycle?"
+        )
+    },
+    {
+        "id": 3,
+        "question": "Explain binary search and its time complexity.",
+        "key_concepts": "binary search, sorted array, O(log n), divide and conquer",
+        "difficulty": "easy",
+        "follow_ups": (
+            "What happens if the array is not sorted?",
+            "Can you implement binary search recursively?",
+            "How does binary search handle duplicate elements?"
+        )
+    },
+    {
+        "id": 4,
+        "question": "What is dynamic programming? Give an example.",
+        "key_concepts": "dynamic programming, memoization, overlapping subproblems, optimization",
+        "difficulty": "hard",
+        "follow_ups": (
+            "What's the difference between memoization and tabulation?",
+            "Can you provide a code example for a dynamic programming problem?",
+            "When would dynamic programming be inefficient?"
+        )
+    },
+    {
+        "id": 5,
+        "question": "Explain how hash tables work and handle collisions.",
+        "key_concepts": "hash tables, hash functions, collision resolution, chaining, open addressing",
+        "difficulty": "medium",
+        "follow_ups": (
+            "What makes a good hash function?",
+            "How does chaining compare to open addressing for collision resolution?",
+            "How does load factor affect hash table performance?"
+        )
+    }
+))
+
+WELCOME_MESSAGE = """Welcome to your AI-driven Data Structures & Algorithms interview!
+
+🧠 Powered by Advanced AI:
+- Dynamic feedback tailored to your specific answers  
+- Smart follow-up questions based on your performance
+- Intelligent conversation that adapts to your responses
+
+📋 Interview Format:
+- 5 DSA questions covering core concepts
+- AI analyzes each answer for technical accuracy and depth
+- Personalized feedback with improvement suggestions
+- Up to 2 follow-up questions per topic to deepen understanding
+- Comprehensive AI-generated performance summary
+
+Ready to begin? Let's start this intelligent interview experience!"""
+
+# Client-facing payload for each question, built once; FIRST_QUESTION opens every session
+QUESTION_PAYLOADS = tuple(
+    MappingProxyType({
+        "id": q['id'],
+        "question": q['question'],
+        "difficulty": q['difficulty'],
+        "key_concepts": q['key_concepts']
+    })
+    for q in QUESTIONS
+)
+FIRST_QUESTION = QUESTION_PAYLOADS[0]
+
+ASSESSMENT_PROMPT = """
+You are a senior software engineer evaluating a DSA interview answer and giving the candidate feedback on it. Analyze the response for technical accuracy, depth, and coverage of key concepts. Be precise and focus on the data structures and algorithms context.
 
 Question: {question}
 Expected key concepts: {key_concepts}
@@ -89,35 +166,29 @@ Quality should be according to score:
 - 8 good
 - 9-10: excellent
 
-Respond in this EXACT format:
+Then write feedback for the candidate that:
+1. Acknowledges strengths in the answer
+2. Highlights areas for improvement with specific DSA concepts
+3. Offers actionable, supportive advice
+4. Uses a professional, encouraging tone
+
+The feedback should be concise, and solely focused on the technical content of the answer without any salutations at the end.
+You MUST NOT USE OR ASK FOR THE CANDIDATES NAME ANYWHERE.
+
+Respond in this EXACT format, with FEEDBACK last:
 SCORE: [0-10]
 CONCEPTS_COVERED: [comma-separated list of concepts mentioned, or "none" if none]
 MISSING_CONCEPTS: [comma-separated list of concepts not mentioned, or "none" if all covered]
 QUALITY: [excellent/good/fair/poor]
 DEPTH: [deep/adequate/shallow]
 DETAILED_ANALYSIS: [Detailed explanation of strengths and weaknesses, mentioning specific DSA concepts]
+FEEDBACK: [Your feedback to the candidate]
 """
-        
-        self.feedback_prompt_template = """
-You are providing constructive feedback for a DSA interview candidate. Be encouraging, specific, and technical.
 
-Question: {question}
-Candidate's answer: {answer}
-Analysis: {analysis}
-Score: {score}/10
-ind: {ind}
+# Separates the analysis fields from the candidate-facing feedback in an assessment
+FEEDBACK_MARKER = "FEEDBACK:"
 
-Provide feedback that:
-1. Acknowledges strengths in the answer
-2. Highlights areas for improvement with specific DSA concepts
-3. Offers actionable, supportive advice
-4. Uses a professional tone
-
-Your response should be concise, and solely focused on the technical content of the answer without any salutations at the end.
-You MUST NOT USE OR ASK FOR THE CANDIDATES NAME ANYWHERE.
-"""
-        
-        self.followup_question_prompt_template = """
+FOLLOWUP_PROMPT = """
 Generate a follow-up question for a DSA interview based on the candidate's response.
 
 Original question: {original_question}
@@ -134,8 +205,8 @@ Create a follow-up question that:
 Respond in this format:
 FOLLOW_UP: [Your follow-up question here]
 """
-        
-        self.conversation_prompt_template = """
+
+CONVERSATION_PROMPT = """
 You are a friendly DSA interviewer. Respond naturally and professionally, staying focused on the interview context.
 
 Context: {context}
@@ -144,6 +215,51 @@ User input: {user_input}
 Respond in this format:
 RESPONSE: [Your response here]
 """
+
+# Completion budgets per prompt, so no call pays for more output than its format needs;
+# the assessment carries both the analysis fields and the feedback
+ASSESSMENT_MAX_TOKENS = 700
+FOLLOWUP_MAX_TOKENS = 80
+CONVERSATION_MAX_TOKENS = 512
+
+# (analysis, feedback) pairs keyed by (question, normalized answer), shared across
+# sessions so a repeated answer to the same question skips the assessment call
+ASSESSMENT_CACHE_SIZE = 512
+_assessment_cache = OrderedDict()
+
+
+def _assessment_cache_key(question, answer):
+    return question, " ".join(answer.lower().split())
+
+
+def canned_feedback(score):
+    """Score-bucketed feedback used when the LLM cannot (or need not) be asked"""
+    if score >= 7:
+        return f"Great answer! You demonstrated good understanding. Score: {score}/10. Try to include more specific DSA concepts."
+    elif score >= 5:
+        return f"Good response with room for improvement. Score: {score}/10. Focus on addressing all key concepts."
+    else:
+        # Since raw_analysis is a string, we can't extract missing_concepts from it
+        # Use a generic fallback message
+        return f"Your answer needs improvement. Score: {score}/10. Please provide more detailed explanations and cover the key concepts."
+
+class LLMPoweredInterviewer:
+    def __init__(self):
+        self.config = get_config()
+        
+        self.reset_interview()
+        
+        # Persistence bookkeeping: the snapshot generation on disk, how many
+        # performance entries it and its log already hold, and the log length
+        # (None until a pickle snapshot exists to append deltas to)
+        self._snapshot_gen = 0
+        self._persisted_perf = 0
+        self._log_records = None
+        
+        self.questions = QUESTIONS
+        self.assessment_prompt_template = ASSESSMENT_PROMPT
+        self.followup_question_prompt_template = FOLLOWUP_PROMPT
+        self.conversation_prompt_template = CONVERSATION_PROMPT
         
     def reset_interview(self):
         self.current_question_idx = 0
@@ -153,51 +269,159 @@ RESPONSE: [Your response here]
         self.current_question = None
         self.current_followup_count = 0
         self.max_followups = 2
-        self.conversation_history = []
-        
-    async def analyze_answer_with_llm(self, question, answer, key_concepts):
-        chain = create_chain(self.analysis_prompt_template)
-        
-        try:
-            analysis_result = await run_chain(chain, {
-                "question": question,
-                "answer": answer,
-                "key_concepts": key_concepts
-            })
-            
-            return parse_analysis(analysis_result)
-        except Exception as e:
-            from .llm_wrappers import fallback_scoring
-            return fallback_scoring(answer, key_concepts)
+        self.conversation_history = deque(maxlen=self.config['HISTORY_WINDOW'])
+        self._main_count = 0
+        self._followup_count = 0
+        self._main_score_sum = 0
+        self._summary_cache = None
+        self._summary_len = -1
     
-    async def generate_feedback_with_llm(self, question, answer, raw_analysis, score, ind):
-        chain = create_chain(self.feedback_prompt_template)
-        
-        try:
-            feedback = await run_chain(chain, {
-                "question": question,
-                "answer": answer,
-                "analysis": raw_analysis,
-                "score": score,
-                "ind": ind
-            })
-            return feedback.replace("FEEDBACK:", "").strip()
-        except Exception as e:
+    def record_performance(self, entry):
+        """Append a TurnRecord, updating the running summary counters"""
+        self.performance_data.append(entry)
+        self._count_performance(entry)
+    
+    def _count_performance(self, entry):
+        if entry.is_followup:
+            self._followup_count += 1
+        else:
+            self._main_count += 1
+            self._main_score_sum += entry.analysis['score']
+    
+    def _recount_performance(self):
+        """Rebuild the summary counters from performance_data (e.g. after loading from disk)"""
+        self._main_count = 0
+        self._followup_count = 0
+        self._main_score_sum = 0
+        for entry in self.performance_data:
+            self._count_performance(entry)
+        self._summary_len = -1
+    
+    def performance_summary(self):
+        """End-of-session metrics, memoized until performance_data grows"""
+        if self._summary_len == len(self.performance_data):
+            return self._summary_cache
+        
+        score_sum = score_n = followups = 0
+        strengths = []
+        weaknesses = []
+        recommendations = []
+        
+        for perf in self.performance_data:
+            if perf.is_followup:
+                followups += 1
+                continue
+            analysis = perf.analysis
+            score = analysis['score']
+            score_n += 1
+            score_sum += score
             if score >= 7:
-                return f"Great answer! You demonstrated good understanding. Score: {score}/10. Try to include more specific DSA concepts."
-            elif score >= 5:
-                return f"Good response with room for improvement. Score: {score}/10. Focus on addressing all key concepts."
+                strengths.append(f"Good understanding of {perf.question}")
             else:
-                # Since raw_analysis is a string, we can't extract missing_concepts from it
-                # Use a generic fallback message
-                return f"Your answer needs improvement. Score: {score}/10. Please provide more detailed explanations and cover the key concepts."
+                weaknesses.append(f"Needs improvement in {', '.join(analysis['missing_concepts'])}")
+        
+        avg_score = score_sum / score_n if score_n else 0
+        
+        if self.performance_data:
+            if avg_score < 6:
+                recommendations.append("Review fundamental DSA concepts")
+                recommendations.append("Practice more coding problems")
+            if avg_score >= 6:
+                recommendations.append("Continue practicing advanced problems")
+        
+        self._summary_cache = {
+            "average_score": round(avg_score, 1),
+            "total_questions": score_n,
+            "followups_count": followups,
+            "strengths": strengths[:3],
+            "weaknesses": weaknesses[:3],
+            "recommendations": recommendations[:3]
+        }
+        self._summary_len = len(self.performance_data)
+        return self._summary_cache
+        
+    async def assess_answer_with_llm(self, question, answer, key_concepts, on_analysis=None, on_chunk=None):
+        """Analyze an answer and write its feedback in one LLM call.
+        
+        on_analysis is awaited with the parsed analysis as soon as the analysis part of
+        the response is complete; on_chunk is awaited with feedback text as it streams.
+        Returns (analysis, feedback).
+        """
+        cache_key = _assessment_cache_key(question, answer)
+        cached = _assessment_cache.get(cache_key)
+        if cached is not None:
+            _assessment_cache.move_to_end(cache_key)
+            analysis, feedback = dict(cached[0]), cached[1]
+            if on_analysis is not None:
+                await on_analysis(analysis)
+            if on_chunk is not None:
+                await on_chunk(feedback)
+            return analysis, feedback
+        
+        chain = create_chain(self.assessment_prompt_template, max_tokens=ASSESSMENT_MAX_TOKENS)
+        inputs = {
+            "question": question,
+            "answer": answer,
+            "key_concepts": key_concepts
+        }
+        
+        analysis = None
+        head = ""
+        parts = []
+        failed = False
+        # Only the LLM stream is guarded; errors raised by the callbacks propagate
+        async with aclosing(stream_chain(chain, inputs)) as stream:
+            while True:
+                try:
+                    chunk = await anext(stream)
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    logger.warning("Answer assessment stream failed: %s", e)
+                    failed = True
+                    break
+                if analysis is None:
+                    # Buffer until the feedback starts, then hand the analysis over straight away
+                    head += chunk
+                    head, marker, chunk = head.partition(FEEDBACK_MARKER)
+                    if not marker:
+                        continue
+                    analysis = parse_analysis(head)
+                    if on_analysis is not None:
+                        await on_analysis(analysis)
+                if not parts:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                parts.append(chunk)
+                if on_chunk is not None:
+                    await on_chunk(chunk)
+        complete = analysis is not None and not failed
+        
+        if analysis is None:
+            # A stream cut off inside the analysis can't be trusted, so score it locally
+            analysis = parse_analysis(head) if head and not failed else fallback_scoring(answer, key_concepts)
+            if on_analysis is not None:
+                await on_analysis(analysis)
+        
+        # Feedback already streamed to the client is kept even if the stream broke off
+        feedback = "".join(parts).strip()
+        if not feedback:
+            feedback = canned_feedback(analysis['score'])
+        
+        if complete:
+            _assessment_cache[cache_key] = (analysis, feedback)
+            if len(_assessment_cache) > ASSESSMENT_CACHE_SIZE:
+                _assessment_cache.popitem(last=False)
+            analysis = dict(analysis)
+        return analysis, feedback
     
-    async def should_ask_followup_llm(self, question, answer, score, analysis):
+    def should_ask_followup(self, score):
         # Ask follow-up for medium scores (3-7), move forward for very low (0-2) or high (8-10) scores
         return 3 <= score
             
     async def generate_followup_question_llm(self, original_question, answer, key_concepts, analysis):
-        chain = create_chain(self.followup_question_prompt_template)
+        chain = create_chain(self.followup_question_prompt_template, max_tokens=FOLLOWUP_MAX_TOKENS)
         
         try:
             followup = await run_chain(chain, {
@@ -208,11 +432,11 @@ RESPONSE: [Your response here]
             })
             return followup.replace("FOLLOW_UP:", "").strip()
         except Exception as e:
-            print(f"Exception occurred: {e}")
+            logger.warning("Follow-up generation failed, using a canned follow-up: %s", e)
             return random.choice(self.current_question['follow_ups'])
     
     async def handle_conversation_llm(self, context, user_input):
-        chain = create_chain(self.conversation_prompt_template)
+        chain = create_chain(self.conversation_prompt_template, max_tokens=CONVERSATION_MAX_TOKENS)
         
         try:
             response = await run_chain(chain, {
@@ -239,52 +463,48 @@ RESPONSE: [Your response here]
     
     async def process_answer(self, user_input):
         current_q = self.current_question
-        
-        analysis = await self.analyze_answer_with_llm(
-            current_q['question'], 
-            user_input, 
-            current_q['key_concepts']
-        )
-        
-        feedback = await self.generate_feedback_with_llm(
-            current_q['question'],
+        question_text = current_q['question']
+        key_concepts = current_q['key_concepts']
+        
+        # The follow-up only depends on the analysis, so generate it while the feedback streams
+        followup_task = None
+        
+        async def on_analysis(analysis):
+            nonlocal followup_task
+            should_followup = self.should_ask_followup(analysis['score'])
+            if should_followup and self.current_followup_count < self.max_followups:
+                followup_task = asyncio.create_task(self.generate_followup_question_llm(
+                    question_text,
+                    user_input,
+                    key_concepts,
+                    analysis['raw_analysis']
+                ))
+        
+        analysis, feedback = await self.assess_answer_with_llm(
+            question_text,
             user_input,
-            analysis['raw_analysis'],
-            analysis['score'],
-            self.current_question_idx
+            key_concepts,
+            on_analysis=on_analysis
         )
         
-        self.performance_data.append({
-            "question_id": current_q['id'],
-            "question": current_q['question'],
-            "answer": user_input,
-            "analysis": analysis,
-            "feedback": feedback,
-            "timestamp": datetime.now().isoformat(),
-            "is_followup": False
-        })
+        self.record_performance(TurnRecord(
+            question_id=current_q['id'],
+            question=question_text,
+            answer=user_input,
+            analysis=analysis,
+            feedback=feedback,
+            is_followup=False
+        ))
         
         self.conversation_history.append({"role": "user", "content": user_input})
         self.conversation_history.append({"role": "assistant", "content": feedback})
         
         response = f"**Analysis & Feedback:**\n{feedback}\n\n"
         
-        should_followup = await self.should_ask_followup_llm(
-            current_q['question'],
-            user_input,
-            analysis['score'],
-            analysis['raw_analysis']
-        )
-        
-        if should_followup and self.current_followup_count < self.max_followups:
+        if followup_task is not None:
             self.stage = "following_up"
             self.current_followup_count += 1
-            followup_q = await self.generate_followup_question_llm(
-                current_q['question'],
-                user_input,
-                current_q['key_concepts'],
-                analysis['raw_analysis']
-            )
+            followup_q = await followup_task
             response += f"**Follow-up {self.current_followup_count}:**\n{followup_q}"
             self.conversation_history.append({"role": "assistant", "content": followup_q})
         else:
@@ -295,51 +515,47 @@ RESPONSE: [Your response here]
     
     async def process_followup(self, user_input):
         current_q = self.current_question
-        
-        analysis = await self.analyze_answer_with_llm(
-            current_q['follow_ups'][self.current_followup_count - 1],
+        followup_text = current_q['follow_ups'][self.current_followup_count - 1]
+        key_concepts = current_q['key_concepts']
+        
+        # The follow-up only depends on the analysis, so generate it while the feedback streams
+        followup_task = None
+        
+        async def on_analysis(analysis):
+            nonlocal followup_task
+            should_followup = self.should_ask_followup(analysis['score'])
+            if should_followup and self.current_followup_count < self.max_followups:
+                followup_task = asyncio.create_task(self.generate_followup_question_llm(
+                    current_q['question'],
+                    user_input,
+                    key_concepts,
+                    analysis['raw_analysis']
+                ))
+        
+        analysis, feedback = await self.assess_answer_with_llm(
+            followup_text,
             user_input,
-            current_q['key_concepts']
+            key_concepts,
+            on_analysis=on_analysis
         )
         
-        feedback = await self.generate_feedback_with_llm(
-            current_q['follow_ups'][self.current_followup_count - 1],
-            user_input,
-            analysis['raw_analysis'],
-            analysis['score'],
-            self.current_question_idx
-        )
-        
-        self.performance_data.append({
-            "question_id": current_q['id'],
-            "question": current_q['follow_ups'][self.current_followup_count - 1],
-            "answer": user_input,
-            "analysis": analysis,
-            "feedback": feedback,
-            "timestamp": datetime.now().isoformat(),
-            "is_followup": True
-        })
+        self.record_performance(TurnRecord(
+            question_id=current_q['id'],
+            question=followup_text,
+            answer=user_input,
+            analysis=analysis,
+            feedback=feedback,
+            is_followup=True
+        ))
         
         self.conversation_history.append({"role": "user", "content": user_input})
         self.conversation_history.append({"role": "assistant", "content": feedback})
         
         response = f"**Follow-up Analysis & Feedback:**\n{feedback}\n\n"
         
-        should_followup = await self.should_ask_followup_llm(
-            current_q['follow_ups'][self.current_followup_count - 1],
-            user_input,
-            analysis['score'],
-            analysis['raw_analysis']
-        )
-        
-        if should_followup and self.current_followup_count < self.max_followups:
+        if followup_task is not None:
             self.current_followup_count += 1
-            followup_q = await self.generate_followup_question_llm(
-                current_q['question'],
-                user_input,
-                current_q['key_concepts'],
-                analysis['raw_analysis']
-            )
+            followup_q = await followup_task
             response += f"**Follow-up {self.current_followup_count}:**\n{followup_q}"
             self.conversation_history.append({"role": "assistant", "content": followup_q})
         else:
@@ -367,13 +583,13 @@ RESPONSE: [Your response here]
         if not self.performance_data:
             return "🎉 **Interview Complete!** Thank you for your time!"
         
-        main_scores = [p['analysis']['score'] for p in self.performance_data if not p['is_followup']]
-        avg_score = sum(main_scores) / len(main_scores) if main_scores else 0
+        avg_score = self._main_score_sum / self._main_count if self._main_count else 0
         
-        history_summary = "\n".join([f"{h['role']}: {h['content']}" for h in self.conversation_history[-10:]])
+        recent_history = islice(self.conversation_history, max(0, len(self.conversation_history) - 10), None)
+        history_summary = "\n".join([f"{h['role']}: {truncate_text(h['content'])}" for h in recent_history])
         context = f"""Generate a DSA interview summary.
-                    Questions answered: {len([p for p in self.performance_data if not p['is_followup']])}
-                    Follow-ups answered: {len([p for p in self.performance_data if p['is_followup']])}
+                    Questions answered: {self._main_count}
+                    Follow-ups answered: {self._followup_count}
                     Average score (main questions): {avg_score:.1f}/10
                     Recent conversation: {history_summary}
                     
@@ -395,49 +611,139 @@ RESPONSE: [Your response here]
 {llm_summary}
 
 **📊 Performance Metrics:**
-- Main questions answered: {len([p for p in self.performance_data if not p['is_followup']])}
-- Follow-up questions answered: {len([p for p in self.performance_data if p['is_followup']])}
+- Main questions answered: {self._main_count}
+- Follow-up questions answered: {self._followup_count}
 - Average score (main questions): {avg_score:.1f}/10 ({(avg_score/10)*100:.0f}%)
 
 **📋 Question Breakdown:**"""
         
-        for i, perf in enumerate(self.performance_data, 1):
-            score = perf['analysis']['score']
-            q_type = "Follow-up" if perf['is_followup'] else "Main"
-            summary += f"\n{i}. {q_type} Q: {score}/10"
+        breakdown = [
+            f"{i}. {'Follow-up' if perf.is_followup else 'Main'} Q: {perf.analysis['score']}/10"
+            for i, perf in enumerate(self.performance_data, 1)
+        ]
         
-        return summary
+        return summary + "\n" + "\n".join(breakdown)
     
-    def get_state(self):
+    def snapshot(self):
+        """Copy of the interview state that stays valid while the interviewer keeps changing.
+        
+        Taken on the event loop so the flusher thread never iterates live containers;
+        TurnRecords are never modified once appended, so they are shared, not copied.
+        """
         return {
             "current_question_idx": self.current_question_idx,
             "questions_asked": self.questions_asked,
             "stage": self.stage,
-            "current_question": self.current_question,
+            "current_question": dict(self.current_question) if self.current_question is not None else None,
             "current_followup_count": self.current_followup_count,
-            "performance_data": self.performance_data,
-            "conversation_history": self.conversation_history
+            "performance_data": tuple(self.performance_data),
+            "conversation_history": list(self.conversation_history)
         }
     
-    def save_to_file(self, session_id):
-        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-        os.makedirs(data_dir, exist_ok=True)
+    def get_state(self, perf_start=0, snapshot=None):
+        """Interview state as plain data; perf_start skips performance entries already saved"""
+        state = dict(snapshot or self.snapshot())
+        state['performance_data'] = [entry.to_dict() for entry in islice(state['performance_data'], perf_start, None)]
+        return state
+    
+    def save_to_file(self, session_id, snapshot=None):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        
+        file_path = os.path.join(DATA_DIR, f'{session_id}{SESSION_EXT}')
+        tmp_path = f'{file_path}.tmp'
+        
+        # A new generation makes any log left from the previous snapshot inert,
+        # so a crash before the log is removed can't replay stale deltas
+        state = self.get_state(snapshot=snapshot)
+        state['snapshot_gen'] = self._snapshot_gen + 1
+        
+        # Write to a temp file and swap it in so a crash never leaves a partial session file
+        with open(tmp_path, 'wb', buffering=1 << 16) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+        
+        try:
+            os.remove(session_log_path(session_id))
+        except FileNotFoundError:
+            pass
+        
+        self._snapshot_gen = state['snapshot_gen']
+        self._persisted_perf = len(state['performance_data'])
+        self._log_records = 0
+    
+    def save_delta_to_file(self, session_id, snapshot=None):
+        """Append what changed since the last save to the session log, compacting into a full snapshot periodically"""
+        if self._log_records is None or self._log_records >= LOG_COMPACT_RECORDS:
+            self.save_to_file(session_id, snapshot)
+            return
+        
+        # Only new performance entries are written; the history is bounded by HISTORY_WINDOW
+        perf_start = self._persisted_perf
+        delta = self.get_state(perf_start, snapshot)
+        delta['perf_start'] = perf_start
+        delta['snapshot_gen'] = self._snapshot_gen
         
-        with open(os.path.join(data_dir, f'{session_id}.json'), 'w') as f:
-            json.dump(self.get_state(), f, indent=2)
+        try:
+            with open(session_log_path(session_id), 'ab', buffering=1 << 16) as f:
+                pickle.dump(delta, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # The log may now end in a partial record that replay stops at, so the
+            # next save rewrites a full snapshot instead of appending after it
+            self._log_records = None
+            raise
+        
+        self._persisted_perf = perf_start + len(delta['performance_data'])
+        self._log_records += 1
+    
+    def _apply_state(self, state):
+        self.current_question_idx = state['current_question_idx']
+        self.questions_asked = state['questions_asked']
+        self.stage = state['stage']
+        self.current_question = state['current_question']
+        self.current_followup_count = state['current_followup_count']
+        self.conversation_history = deque(state['conversation_history'], maxlen=self.config['HISTORY_WINDOW'])
     
     def load_from_file(self, session_id):
-        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-        file_path = os.path.join(data_dir, f'{session_id}.json')
-        
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                state = json.load(f)
-                
-            self.current_question_idx = state['current_question_idx']
-            self.questions_asked = state['questions_asked']
-            self.stage = state['stage']
-            self.current_question = state['current_question']
-            self.current_followup_count = state['current_followup_count']
-            self.performance_data = state['performance_data']
-            self.conversation_history = state['conversation_history']
+        file_path = session_file_path(session_id)
+        
+        if file_path:
+            with open(file_path, 'rb') as f:
+                if file_path.endswith(SESSION_EXT):
+                    state = pickle.load(f)
+                else:
+                    state = orjson.loads(f.read())
+            
+            self._apply_state(state)
+            self.performance_data = [TurnRecord(**entry) for entry in state['performance_data']]
+            
+            # Replay deltas appended since the snapshot; a legacy JSON file has none
+            # and gets rewritten as a full snapshot on its next save
+            self._log_records = None
+            if 'snapshot_gen' in state:
+                self._snapshot_gen = state['snapshot_gen']
+                self._log_records = 0
+                self._replay_log(session_id)
+            
+            self._persisted_perf = len(self.performance_data)
+            self._recount_performance()
+    
+    def _replay_log(self, session_id):
+        try:
+            f = open(session_log_path(session_id), 'rb')
+        except FileNotFoundError:
+            return
+        
+        with f:
+            while True:
+                try:
+                    delta = pickle.load(f)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    logger.warning("Truncated delta log for session %s; ignoring the tail", session_id)
+                    break
+                if delta['snapshot_gen'] != self._snapshot_gen:
+                    continue
+                self._apply_state(delta)
+                self.performance_data[delta['perf_start']:] = [TurnRecord(**entry) for entry in delta['performance_data']]
+                self._log_records += 1
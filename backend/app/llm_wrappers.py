@@ -1,21 +1,44 @@
 import re
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Any, Optional, Sequence, Tuple, Union
 from langchain.prompts import PromptTemplate
 from langchain_openai import OpenAI
 from .config import Config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Matches {variable} placeholders in prompt templates
+_TEMPLATE_VAR_RE = re.compile(r'\{(\w+)\}')
+
+# Whitespace-delimited word, counted without materializing a token list
+_WORD_RE = re.compile(r'\S+')
+
+# raw_analysis marker for heuristic scores produced without the LLM
+FALLBACK_RAW_ANALYSIS = "Analysis temporarily unavailable. Using fallback scoring."
+
+# Matches every structured field of an analysis response in one scan
+_ANALYSIS_FIELD_RE = re.compile(
+    r'SCORE:\s*(?P<score>\d+)'
+    r'|CONCEPTS_COVERED:[ \t]*(?P<concepts_covered>[^\n]*)'
+    r'|MISSING_CONCEPTS:[ \t]*(?P<missing_concepts>[^\n]*)'
+    r'|QUALITY:[ \t]*(?P<quality>[^\n]*)'
+    r'|DEPTH:[ \t]*(?P<depth>[^\n]*)'
+    r'|DETAILED_ANALYSIS:[ \t]*(?P<detailed_analysis>[^\n]*)'
+)
+
 class LLMService:
     """Service class for managing LLM operations with enhanced error handling and caching"""
     
+    __slots__ = ('config', '_llm_cache', '_chain_cache')
+    
     def __init__(self):
         self.config = Config()
         self._llm_cache = {}
+        self._chain_cache = {}
         
     def _get_llm(self, model_name: Optional[str] = None) -> OpenAI:
         """Get or create LLM instance with caching"""
@@ -25,83 +48,138 @@ class LLMService:
             self._llm_cache[model] = OpenAI(
                 temperature=self.config.LLM_TEMPERATURE,
                 openai_api_key=self.config.OPENAI_API_KEY,
-                model_name=model
+                model_name=model,
+                timeout=self.config.LLM_TIMEOUT,
+                http_client=_HTTP_CLIENT,
+                http_async_client=_ASYNC_HTTP_CLIENT
             )
-            logger.info(f"Created new LLM instance for model: {model}")
+            logger.info("Created new LLM instance for model: %s", model)
         
         return self._llm_cache[model]
     
-    def create_chain(self, prompt_template_string: str, model_name: Optional[str] = None):
-        """Create a LangChain chain with the given prompt template"""
+    def create_chain(self, prompt_template_string: str, model_name: Optional[str] = None, max_tokens: Optional[int] = None):
+        """Create a LangChain chain with the given prompt template, reusing cached chains.
+        
+        max_tokens caps the completion length for this chain; None keeps the model default.
+        """
+        model = model_name or self.config.LLM_MODEL
+        cache_key = (prompt_template_string, model, max_tokens)
+        
+        chain = self._chain_cache.get(cache_key)
+        if chain is not None:
+            return chain
+        
         try:
-            llm = self._get_llm(model_name)
+            llm = self._get_llm(model)
+            if max_tokens is not None:
+                llm = llm.bind(max_tokens=max_tokens)
             
             # Extract input variables from template
-            input_variables = list(re.findall(r'\{(\w+)\}', prompt_template_string))
+            input_variables = list(_TEMPLATE_VAR_RE.findall(prompt_template_string))
             
             prompt = PromptTemplate(
                 input_variables=input_variables,
                 template=prompt_template_string
             )
             
-            logger.info(f"Created chain with {len(input_variables)} input variables")
-            return prompt | llm
+            chain = prompt | llm
+            self._chain_cache[cache_key] = chain
+            logger.info("Created chain with %d input variables", len(input_variables))
+            return chain
             
         except Exception as e:
-            logger.error(f"Failed to create chain: {e}")
+            logger.error("Failed to create chain: %s", e)
             raise
 
+# Dedicated pool for blocking LLM calls so they don't compete with the default executor
+_LLM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=Config.LLM_MAX_CONCURRENCY,
+    thread_name_prefix='llm'
+)
+
+# Connection pools shared by every model's client, sized to the executor and kept
+# alive across the idle gaps between turns so calls skip the TCP/TLS handshake.
+# invoke in the executor uses the sync pool; astream (the assessment path) the async one
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=Config.LLM_MAX_CONCURRENCY,
+    keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY
+)
+_HTTP_TIMEOUT = httpx.Timeout(Config.LLM_TIMEOUT)
+_HTTP_CLIENT = httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+_ASYNC_HTTP_CLIENT = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+def shutdown_llm_executor():
+    """Release the LLM worker threads without waiting on in-flight calls"""
+    _LLM_EXECUTOR.shutdown(wait=False)
+    _HTTP_CLIENT.close()
+
+async def close_async_http_client():
+    """Close the async connection pool used by streamed LLM calls"""
+    await _ASYNC_HTTP_CLIENT.aclose()
+
 # Global service instance
 llm_service = LLMService()
 
-def create_chain(prompt_template_string: str, model_name: Optional[str] = None):
+def create_chain(prompt_template_string: str, model_name: Optional[str] = None, max_tokens: Optional[int] = None):
     """Legacy function for backward compatibility"""
-    return llm_service.create_chain(prompt_template_string, model_name)
+    return llm_service.create_chain(prompt_template_string, model_name, max_tokens)
 
 async def run_chain(chain, inputs: Dict[str, Any], stream: bool = False) -> str:
     """Run a LangChain chain asynchronously with enhanced error handling"""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     
     try:
-        logger.info(f"Running chain with inputs: {list(inputs.keys())}")
-        result = await loop.run_in_executor(None, lambda: chain.invoke(inputs))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Running chain with inputs: %s", list(inputs.keys()))
+        result = await loop.run_in_executor(_LLM_EXECUTOR, chain.invoke, inputs)
         
         # Ensure result is a string
         if isinstance(result, str):
-            logger.info(f"Chain result length: {len(result)} characters")
+            logger.info("Chain result length: %d characters", len(result))
             return result
         else:
-            logger.warning(f"Unexpected result type: {type(result)}, converting to string")
+            logger.warning("Unexpected result type: %s, converting to string", type(result))
             return str(result)
             
     except Exception as e:
-        logger.error(f"Chain execution failed: {e}")
+        logger.error("Chain execution failed: %s", e)
+        raise e
+
+async def stream_chain(chain, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+    """Stream a LangChain chain's output chunk by chunk using the native async API"""
+    try:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Streaming chain with inputs: %s", list(inputs.keys()))
+        async for chunk in chain.astream(inputs):
+            yield chunk if isinstance(chunk, str) else str(chunk)
+            
+    except Exception as e:
+        logger.error("Chain streaming failed: %s", e)
         raise e
 
 def parse_analysis(raw_text: str) -> Dict[str, Any]:
     """Parse structured analysis response from LLM with enhanced error handling"""
     try:
-        # Extract all required fields using regex
-        score_match = re.search(r'SCORE:\s*(\d+)', raw_text)
-        concepts_covered_match = re.search(r'CONCEPTS_COVERED:\s*([^\n]*)', raw_text)
-        missing_concepts_match = re.search(r'MISSING_CONCEPTS:\s*([^\n]*)', raw_text)
-        quality_match = re.search(r'QUALITY:\s*([^\n]*)', raw_text)
-        depth_match = re.search(r'DEPTH:\s*([^\n]*)', raw_text)
-        detailed_analysis_match = re.search(r'DETAILED_ANALYSIS:\s*([^\n]*)', raw_text)
+        # Extract all required fields in a single pass; the first occurrence of each field wins
+        fields = {}
+        for match in _ANALYSIS_FIELD_RE.finditer(raw_text):
+            field = match.lastgroup
+            if field not in fields:
+                fields[field] = match.group(field)
         
-        # Parse with fallbacks
-        score = int(score_match.group(1)) if score_match else 5
-        concepts_covered_str = concepts_covered_match.group(1).strip() if concepts_covered_match else "none"
-        missing_concepts_str = missing_concepts_match.group(1).strip() if missing_concepts_match else "none"
-        quality = quality_match.group(1).strip() if quality_match else "fair"
-        depth = depth_match.group(1).strip() if depth_match else "adequate"
-        detailed_analysis = detailed_analysis_match.group(1).strip() if detailed_analysis_match else "Analysis unavailable."
+        # Parse with fallbacks (missing or blank fields get defaults)
+        score = int(fields['score']) if 'score' in fields else 5
+        concepts_covered_str = fields.get('concepts_covered', '').strip()
+        missing_concepts_str = fields.get('missing_concepts', '').strip()
+        quality = fields.get('quality', '').strip() or "fair"
+        depth = fields.get('depth', '').strip() or "adequate"
+        detailed_analysis = fields.get('detailed_analysis', '').strip() or "Analysis unavailable."
         
         # Process concept lists
-        concepts_covered = [c.strip() for c in concepts_covered_str.split(',')] if concepts_covered_str != "none" else []
-        missing_concepts = [c.strip() for c in missing_concepts_str.split(',')] if missing_concepts_str != "none" else []
+        concepts_covered = _split_csv(concepts_covered_str)
+        missing_concepts = _split_csv(missing_concepts_str)
         
-        logger.info(f"Parsed analysis: score={score}, quality={quality}, depth={depth}")
+        logger.info("Parsed analysis: score=%s, quality=%s, depth=%s", score, quality, depth)
         
         return {
             "raw_analysis": raw_text,
@@ -115,22 +193,36 @@ def parse_analysis(raw_text: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Failed to parse analysis: {e}")
+        logger.error("Failed to parse analysis: %s", e)
         return fallback_scoring("", "")
 
-def fallback_scoring(answer: str, key_concepts: str = "") -> Dict[str, Any]:
+def _split_csv(value: str) -> List[str]:
+    """Split a comma-separated list, treating empty or "none" as no items"""
+    if not value or value == "none":
+        return []
+    return [item for item in (part.strip() for part in value.split(',')) if item]
+
+@lru_cache(maxsize=64)
+def split_concepts(key_concepts: str) -> Tuple[str, ...]:
+    """Split a comma-separated key concepts string into a tuple of concepts"""
+    return tuple(_split_csv(key_concepts))
+
+def fallback_scoring(answer: str, key_concepts: Union[str, Sequence[str]] = "") -> Dict[str, Any]:
     """Provide fallback scoring when LLM analysis fails"""
-    word_count = len(answer.split())
+    if isinstance(key_concepts, str):
+        key_concepts = split_concepts(key_concepts)
+    
+    word_count = sum(1 for _ in _WORD_RE.finditer(answer))
     fallback_score = min(8, max(2, word_count // 10))
     
-    logger.warning(f"Using fallback scoring for answer with {word_count} words")
+    logger.warning("Using fallback scoring for answer with %d words", word_count)
     
     return {
-        "raw_analysis": f"Analysis temporarily unavailable. Using fallback scoring.",
+        "raw_analysis": FALLBACK_RAW_ANALYSIS,
         "score": fallback_score,
         "normalized_score": fallback_score / 10.0,
         "concepts_covered": [],
-        "missing_concepts": [key_concepts] if key_concepts else [],
+        "missing_concepts": list(key_concepts),
         "quality": "fair",
         "depth": "shallow",
         "detailed_analysis": f"Based on answer length ({word_count} words), more detail is needed."
@@ -1,17 +1,48 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
+import logging.config
 from .config import Config
 from .routes import router as api_router
 from .websocket_handlers import websocket_router
+from .llm_wrappers import shutdown_llm_executor, close_async_http_client
+from .session_manager import session_manager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 config = Config()
 
+# Single logging setup for the whole app, applied once in create_app
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(levelname)s:%(name)s:%(message)s"}
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "default"}
+    },
+    "root": {"level": "INFO", "handlers": ["console"]},
+}
+
+# Static payload for the root endpoint, built once at import
+ROOT_RESPONSE = {
+    "message": "DSA Interviewer Backend API",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "start_session": "POST /api/session/start",
+        "send_message": "POST /api/session/{session_id}/message",
+        "get_state": "GET /api/session/{session_id}/state",
+        "end_session": "POST /api/session/{session_id}/end",
+        "export_session": "GET /api/session/{session_id}/export"
+    },
+    "frontend_url": "http://13.203.226.83:3000",
+    "chainlit_url": "http://13.203.226.83:8001"
+}
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -20,16 +51,32 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down DSA Interviewer FastAPI application")
+    shutdown_llm_executor()
+    await close_async_http_client()
+    session_manager.shutdown()
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
+    logging.config.dictConfig(LOGGING_CONFIG)
+    
     app = FastAPI(
         title="DSA Interviewer API",
         description="AI-powered Data Structures & Algorithms Interview Platform",
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
+    # Single fallback for unexpected errors; HTTPExceptions keep FastAPI's own handling.
+    # Registered before CORS so it sits inside it and 500s still carry CORS headers.
+    @app.middleware("http")
+    async def unhandled_exception_middleware(request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+            return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+    
     # Configure CORS
     app.add_middleware(
         CORSMiddleware,
@@ -42,20 +89,7 @@ def create_app() -> FastAPI:
     # Root endpoint
     @app.get("/", response_model=dict)
     async def root():
-        return {
-            "message": "DSA Interviewer Backend API",
-            "version": "1.0.0",
-            "status": "running",
-            "endpoints": {
-                "start_session": "POST /api/session/start",
-                "send_message": "POST /api/session/{session_id}/message",
-                "get_state": "GET /api/session/{session_id}/state",
-                "end_session": "POST /api/session/{session_id}/end",
-                "export_session": "GET /api/session/{session_id}/export"
-            },
-            "frontend_url": "http://13.203.226.83:3000",
-            "chainlit_url": "http://13.203.226.83:8001"
-        }
+        return ROOT_RESPONSE
     
     # Include routers
     app.include_router(api_router, prefix="/api")
@@ -68,10 +102,15 @@ app = create_app()
 
 if __name__ == '__main__':
     import uvicorn
+    # Sessions, connections and the LLM caches live in process memory, so run one
+    # worker per instance. To scale out, route with sticky sessions: hash the
+    # /ws/{connection_id} path consistently (e.g. nginx `hash $request_uri consistent`)
+    # so a client's socket always reaches the instance holding its session.
     uvicorn.run(
         "app.main:app",
         host=config.HOST,
         port=config.PORT,
         reload=config.DEBUG,
+        ws_max_size=config.WS_MAX_MESSAGE_BYTES,
         log_level="info"
     )
@@ -1,16 +1,19 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 class PerformanceEntry(Base):
     __tablename__ = 'performance_entries'
     
     id = Column(Integer, primary_key=True)
-    session_id = Column(String(36), nullable=False)
+    session_id = Column(String(36), nullable=False, index=True)
     question_id = Column(Integer, nullable=False)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
@@ -24,21 +27,35 @@ class PerformanceEntry(Base):
     feedback = Column(Text)
     is_followup = Column(Boolean, default=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('ix_perf_session_followup', 'session_id', 'is_followup'),
+    )
 
 def get_database_url():
     return os.getenv('DATABASE_URL', 'sqlite:///dsa_interviewer.db')
 
+# Engine and session factory are built once per process and reused
+_engine = None
+_session_maker = None
+
 def create_database_engine():
+    global _engine
+    if _engine is not None:
+        return _engine
     try:
-        engine = create_engine(get_database_url())
+        engine = create_engine(get_database_url(), pool_pre_ping=True)
         Base.metadata.create_all(engine)
+        _engine = engine
         return engine
     except Exception as e:
-        print(f"Database initialization failed: {e}")
+        logger.error("Database initialization failed: %s", e)
         return None
 
 def get_session_maker():
-    engine = create_database_engine()
-    if engine:
-        return sessionmaker(bind=engine)
-    return None
+    global _session_maker
+    if _session_maker is None:
+        engine = create_database_engine()
+        if engine:
+            _session_maker = sessionmaker(bind=engine)
+    return _session_maker
@@ -70,7 +70,7 @@ class SessionStateResponse(BaseModel):
     """Response model for session state"""
     success: bool
     data: InterviewState
-    timestamp: str
+    timestamp: datetime
 
 
 class SessionMetadata(BaseModel):
@@ -97,7 +97,7 @@ class SessionExportResponse(BaseModel):
     """Response model for session export"""
     success: bool
     data: Dict[str, Any]
-    timestamp: str
+    timestamp: datetime
 
 
 class SessionStats(BaseModel):
@@ -111,14 +111,14 @@ class SessionStatsResponse(BaseModel):
     """Response model for session stats"""
     success: bool
     data: SessionStats
-    timestamp: str
+    timestamp: datetime
 
 
 class CleanupResponse(BaseModel):
     """Response model for session cleanup"""
     success: bool
     data: Dict[str, int]
-    timestamp: str
+    timestamp: datetime
 
 
 
@@ -1,67 +1,109 @@
 import os
 import json
-import uuid
+import secrets
+import heapq
+import time
 import logging
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Any
-from .interviewer import LLMPoweredInterviewer
+from .interviewer import (
+    LLMPoweredInterviewer, session_file_path, session_log_path, SESSION_EXT, LEGACY_SESSION_EXT
+)
 from .config import Config
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class SessionMeta:
+    """Per-session bookkeeping; last_activity is a time.monotonic() stamp"""
+    created_at: float
+    last_activity: float
+    status: str = 'active'
+    questions_answered: int = 0
+    followups_answered: int = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Render for responses, with timestamps as ISO wall-clock strings"""
+        idle = time.monotonic() - self.last_activity
+        return {
+            'created_at': datetime.fromtimestamp(self.created_at).isoformat(),
+            'last_activity': (datetime.now() - timedelta(seconds=idle)).isoformat(),
+            'status': self.status,
+            'questions_answered': self.questions_answered,
+            'followups_answered': self.followups_answered
+        }
+
 class SessionManager:
     """Enhanced session manager with timeout handling and analytics"""
     
     def __init__(self):
         self.active_sessions: Dict[str, LLMPoweredInterviewer] = {}
-        self.session_metadata: Dict[str, Dict[str, Any]] = {}
+        self.session_metadata: Dict[str, SessionMeta] = {}
         self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
         self.config = Config()
         os.makedirs(self.data_dir, exist_ok=True)
         
-        logger.info(f"SessionManager initialized with data directory: {self.data_dir}")
+        # Ids with a saved session file, indexed once so lookups don't stat the disk
+        self._on_disk: set[str] = {
+            name for name, ext in map(os.path.splitext, os.listdir(self.data_dir))
+            if ext in (SESSION_EXT, LEGACY_SESSION_EXT)
+        }
+        
+        # Expiry bookkeeping: metadata 'last_activity' is a time.monotonic() stamp and
+        # the heap holds one (deadline, id) entry per session, possibly older than the
+        # real deadline; cleanup re-pushes those instead of evicting
+        self._expiry_heap: List[tuple[float, str]] = []
+        
+        # Write-behind persistence: save_session snapshots a session on the event loop
+        # and the flusher thread writes pending snapshots to disk every flush interval.
+        # File removal for deleted sessions is queued to the same thread, after any
+        # write still in flight, so the loop never waits on disk. _lock guards both queues
+        self._pending: Dict[str, dict] = {}
+        self._deleted: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop_flusher = threading.Event()
+        self._flusher_thread = threading.Thread(target=self._flusher, name='session-flusher', daemon=True)
+        self._flusher_thread.start()
+        
+        logger.info("SessionManager initialized with data directory: %s", self.data_dir)
     
     def create_session(self, session_id: Optional[str] = None) -> tuple[str, LLMPoweredInterviewer]:
         """Create a new interview session with optional custom session ID"""
         if session_id is None:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_urlsafe(12)
         
         interviewer = LLMPoweredInterviewer()
         self.active_sessions[session_id] = interviewer
         
         # Initialize session metadata
-        self.session_metadata[session_id] = {
-            'created_at': datetime.now().isoformat(),
-            'last_activity': datetime.now().isoformat(),
-            'status': 'active',
-            'questions_answered': 0,
-            'followups_answered': 0
-        }
+        self._init_metadata(session_id)
         
         # Try to load existing session data
-        file_path = os.path.join(self.data_dir, f'{session_id}.json')
-        if os.path.exists(file_path):
+        if session_id in self._on_disk:
             try:
                 interviewer.load_from_file(session_id)
-                logger.info(f"Loaded existing session data for {session_id}")
+                logger.info("Loaded existing session data for %s", session_id)
             except Exception as e:
-                logger.warning(f"Failed to load session {session_id}: {e}")
+                logger.warning("Failed to load session %s: %s", session_id, e)
         
-        logger.info(f"Created new session: {session_id}")
+        logger.info("Created new session: %s", session_id)
         return session_id, interviewer
     
     def get_session(self, session_id: str) -> Optional[LLMPoweredInterviewer]:
         """Get an active session, loading from disk if necessary"""
-        if session_id in self.active_sessions:
+        interviewer = self.active_sessions.get(session_id)
+        if interviewer is not None:
             # Update last activity
-            if session_id in self.session_metadata:
-                self.session_metadata[session_id]['last_activity'] = datetime.now().isoformat()
-            return self.active_sessions[session_id]
+            metadata = self.session_metadata.get(session_id)
+            if metadata is not None:
+                metadata.last_activity = time.monotonic()
+            return interviewer
         
         # Try to load from disk
-        file_path = os.path.join(self.data_dir, f'{session_id}.json')
-        if os.path.exists(file_path):
+        if session_id in self._on_disk:
             interviewer = LLMPoweredInterviewer()
             try:
                 interviewer.load_from_file(session_id)
@@ -69,77 +111,152 @@ class SessionManager:
                 
                 # Initialize metadata if not exists
                 if session_id not in self.session_metadata:
-                    self.session_metadata[session_id] = {
-                        'created_at': datetime.now().isoformat(),
-                        'last_activity': datetime.now().isoformat(),
-                        'status': 'active',
-                        'questions_answered': 0,
-                        'followups_answered': 0
-                    }
+                    self._init_metadata(session_id)
                 
-                logger.info(f"Loaded session from disk: {session_id}")
+                logger.info("Loaded session from disk: %s", session_id)
                 return interviewer
             except Exception as e:
-                logger.error(f"Failed to load session {session_id}: {e}")
+                logger.error("Failed to load session %s: %s", session_id, e)
         
-        logger.warning(f"Session not found: {session_id}")
+        logger.warning("Session not found: %s", session_id)
         return None
     
+    def _init_metadata(self, session_id: str):
+        """Create a session's metadata and start tracking its idle timeout"""
+        now = time.monotonic()
+        self.session_metadata[session_id] = SessionMeta(created_at=time.time(), last_activity=now)
+        heapq.heappush(self._expiry_heap, (now + self.config.SESSION_TIMEOUT, session_id))
+    
+    def get_metadata(self, session_id: str) -> Dict[str, Any]:
+        """Session metadata as a plain dict for responses"""
+        metadata = self.session_metadata.get(session_id)
+        return metadata.to_dict() if metadata is not None else {}
+    
+    def get_state_with_metadata(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session's interview state with its metadata attached"""
+        interviewer = self.get_session(session_id)
+        if not interviewer:
+            return None
+        
+        state = interviewer.get_state()
+        state['session_metadata'] = self.get_metadata(session_id)
+        return state
+    
     def save_session(self, session_id: str) -> bool:
-        """Save session data to disk with error handling"""
+        """Snapshot a session so the background flusher persists it"""
+        interviewer = self.active_sessions.get(session_id)
+        if interviewer is None:
+            return False
+        snapshot = interviewer.snapshot()
+        with self._lock:
+            self._pending[session_id] = snapshot
+        return True
+    
+    def _write_session(self, session_id: str, snapshot: dict) -> bool:
+        """Write a single session snapshot to disk, requeueing it if the write fails"""
+        interviewer = self.active_sessions.get(session_id)
+        if interviewer is None:
+            return False  # deleted since it was snapshotted
+        try:
+            interviewer.save_delta_to_file(session_id, snapshot)
+        except Exception as e:
+            logger.error("Failed to save session %s: %s", session_id, e)
+            # Retry on the next flush unless a newer snapshot has been queued meanwhile
+            with self._lock:
+                self._pending.setdefault(session_id, snapshot)
+            return False
         if session_id in self.active_sessions:
+            self._on_disk.add(session_id)
+        logger.debug("Saved session: %s", session_id)
+        return True
+    
+    def _remove_session_files(self, session_id: str) -> bool:
+        """Remove a deleted session's files, including a legacy JSON file left beside a pickled one"""
+        success = True
+        try:
+            os.remove(session_log_path(session_id))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Failed to delete session log %s: %s", session_id, e)
+            success = False
+        while (file_path := session_file_path(session_id)):
             try:
-                self.active_sessions[session_id].save_to_file(session_id)
-                logger.info(f"Saved session: {session_id}")
-                return True
+                os.remove(file_path)
+                logger.info("Deleted session file: %s", session_id)
             except Exception as e:
-                logger.error(f"Failed to save session {session_id}: {e}")
-                return False
-        return False
+                logger.error("Failed to delete session file %s: %s", session_id, e)
+                success = False
+                break
+        self._on_disk.discard(session_id)
+        return success
     
-    def delete_session(self, session_id: str) -> bool:
-        """Delete session from memory and disk"""
-        success = True
+    def flush_dirty_sessions(self) -> int:
+        """Persist every session snapshotted since the last flush, then remove deleted ones"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            deleted, self._deleted = self._deleted, set()
         
+        flushed = sum(self._write_session(session_id, snapshot) for session_id, snapshot in pending.items())
+        for session_id in deleted:
+            if session_id not in self.active_sessions:  # not recreated since the delete
+                self._remove_session_files(session_id)
+        return flushed
+    
+    def _flusher(self):
+        """Background loop that flushes dirty sessions until shutdown"""
+        while not self._stop_flusher.wait(self.config.SESSION_FLUSH_INTERVAL):
+            self.flush_dirty_sessions()
+    
+    def shutdown(self):
+        """Stop the flusher thread and write out any remaining dirty sessions"""
+        self._stop_flusher.set()
+        self._flusher_thread.join()
+        flushed = self.flush_dirty_sessions()
+        logger.info("Flushed %d sessions on shutdown", flushed)
+    
+    def delete_session(self, session_id: str) -> bool:
+        """Delete session from memory now and from disk on the flusher's next pass"""
         # Remove from active sessions
         if session_id in self.active_sessions:
             del self.active_sessions[session_id]
-            logger.info(f"Removed session from memory: {session_id}")
+            logger.info("Removed session from memory: %s", session_id)
         
         # Remove metadata
         if session_id in self.session_metadata:
             del self.session_metadata[session_id]
         
-        # Remove from disk
-        file_path = os.path.join(self.data_dir, f'{session_id}.json')
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                logger.info(f"Deleted session file: {session_id}")
-            except Exception as e:
-                logger.error(f"Failed to delete session file {session_id}: {e}")
-                success = False
+        # Drop any pending write so the flusher doesn't recreate the file, and hand it
+        # the file removal; any write already in flight finishes before that runs
+        self._on_disk.discard(session_id)
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._deleted.add(session_id)
         
-        return success
+        return True
     
     def cleanup_expired_sessions(self) -> int:
         """Clean up sessions that have exceeded the timeout period"""
         timeout_seconds = self.config.SESSION_TIMEOUT
-        cutoff_time = datetime.now() - timedelta(seconds=timeout_seconds)
+        now = time.monotonic()
+        heap = self._expiry_heap
         cleaned_count = 0
         
-        expired_sessions = []
-        for session_id, metadata in self.session_metadata.items():
-            last_activity = datetime.fromisoformat(metadata['last_activity'])
-            if last_activity < cutoff_time:
-                expired_sessions.append(session_id)
-        
-        for session_id in expired_sessions:
+        # Only sessions whose heap entry has come due are examined
+        while heap and heap[0][0] < now:
+            _, session_id = heapq.heappop(heap)
+            metadata = self.session_metadata.get(session_id)
+            if metadata is None:
+                continue  # already deleted
+            expires_at = metadata.last_activity + timeout_seconds
+            if expires_at >= now:
+                heapq.heappush(heap, (expires_at, session_id))  # touched since it was scheduled
+                continue
             self.delete_session(session_id)
             cleaned_count += 1
         
         if cleaned_count > 0:
-            logger.info(f"Cleaned up {cleaned_count} expired sessions")
+            logger.info("Cleaned up %d expired sessions", cleaned_count)
         
         return cleaned_count
     
@@ -158,7 +275,7 @@ class SessionManager:
         """Export comprehensive session data for analysis"""
         interviewer = self.get_session(session_id)
         if interviewer:
-            metadata = self.session_metadata.get(session_id, {})
+            metadata = self.get_metadata(session_id)
             return {
                 'session_id': session_id,
                 'state': interviewer.get_state(),
@@ -5,11 +5,13 @@ FastAPI WebSocket handlers for real-time communication
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 import asyncio
-import json
 import logging
+import orjson
+from dataclasses import dataclass, field
+from functools import wraps
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from .interviewer import LLMPoweredInterviewer
+from .interviewer import LLMPoweredInterviewer, TurnRecord, WELCOME_MESSAGE, QUESTION_PAYLOADS
 from .session_manager import session_manager
 from .config import Config
 
@@ -17,329 +19,387 @@ from .config import Config
 logger = logging.getLogger(__name__)
 config = Config()
 
+# How long the client keeps the analysis on screen before showing what comes next
+ANALYSIS_DISPLAY_MS = 3000
+
+# The welcome text and question payloads never change, so they are encoded once and
+# spliced into outgoing frames as-is instead of being re-serialized per message
+WELCOME_JSON = orjson.Fragment(orjson.dumps(WELCOME_MESSAGE))
+QUESTION_JSON = tuple(orjson.Fragment(orjson.dumps(dict(payload))) for payload in QUESTION_PAYLOADS)
+
+# Longest error text echoed to the client; exception messages can be arbitrarily long
+ERROR_MESSAGE_MAX = 256
+
+def error_event(message: str) -> dict:
+    """Build an error event, truncating the message to ERROR_MESSAGE_MAX characters"""
+    return {"type": "error", "data": {"message": message[:ERROR_MESSAGE_MAX]}}
+
+# Fixed error events are built once and shared; messages are never mutated after queueing
+ERROR_MESSAGE_TOO_LARGE = error_event("Message too large")
+ERROR_INVALID_DATA = error_event("Invalid data format received")
+ERROR_NO_SESSION_STARTED = error_event("Session not found. Please start a new session.")
+ERROR_EMPTY_MESSAGE = error_event("Message is required and cannot be empty")
+ERROR_SESSION_NOT_FOUND = error_event("Session not found")
+
+# Most queued messages a connection's writer coalesces into one batch frame
+WRITER_BATCH_MAX = 32
+
 # Create router for WebSocket endpoints
 websocket_router = APIRouter()
 
-# Store active WebSocket connections
-active_connections: Dict[str, WebSocket] = {}
+@dataclass(slots=True)
+class Connection:
+    """Everything tracked for one open WebSocket, so a message needs a single lookup"""
+    websocket: WebSocket
+    # Outgoing messages are queued and written by the writer task, so handlers
+    # never wait on the network between events
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    writer_task: Optional[asyncio.Task] = None
+    session_id: Optional[str] = None  # the interview session started on this connection
 
 class ConnectionManager:
     """Manage WebSocket connections"""
     
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.session_id_mapping: Dict[str, str] = {}  # Maps connection_id -> actual_session_id
+        self.connections: Dict[str, Connection] = {}
     
-    async def connect(self, websocket: WebSocket, connection_id: str):
-        """Accept WebSocket connection and store it"""
+    async def connect(self, websocket: WebSocket, connection_id: str) -> Connection:
+        """Accept WebSocket connection, store it and start its writer task"""
         await websocket.accept()
-        self.active_connections[connection_id] = websocket
-        logger.info(f"WebSocket connected with connection ID: {connection_id}")
+        
+        # Clients reuse their connection ID when reconnecting; retire the connection it replaces
+        old = self.connections.get(connection_id)
+        conn = self.connections[connection_id] = Connection(websocket)
+        conn.writer_task = asyncio.create_task(self._writer(connection_id, conn))
+        if old is not None:
+            old.queue.put_nowait(None)
+            try:
+                await old.websocket.close()
+            except Exception as e:
+                logger.debug("Closing replaced connection %s failed: %s", connection_id, e)
+        logger.info("WebSocket connected with connection ID: %s", connection_id)
         
         # Send connection confirmation
         await self.send_message(connection_id, {
             "type": "connected",
             "data": {"message": "Connected to DSA Interviewer"}
         })
+        return conn
     
-    def disconnect(self, connection_id: str):
-        """Remove WebSocket connection"""
-        if connection_id in self.active_connections:
-            del self.active_connections[connection_id]
-            # Clean up session mapping if exists
-            if connection_id in self.session_id_mapping:
-                del self.session_id_mapping[connection_id]
-            logger.info(f"WebSocket disconnected for connection: {connection_id}")
+    def disconnect(self, connection_id: str, conn: Connection):
+        """Remove WebSocket connection, unless a reconnect has already replaced it"""
+        if self.connections.get(connection_id) is conn:
+            del self.connections[connection_id]
+            logger.info("WebSocket disconnected for connection: %s", connection_id)
+        # The writer sends whatever is still queued, then exits at the sentinel
+        conn.queue.put_nowait(None)
     
     def map_session_id(self, connection_id: str, session_id: str):
         """Map connection ID to actual session ID"""
-        self.session_id_mapping[connection_id] = session_id
-        logger.info(f"Mapped connection {connection_id} to session {session_id}")
+        conn = self.connections.get(connection_id)
+        if conn is not None:
+            conn.session_id = session_id
+            logger.info("Mapped connection %s to session %s", connection_id, session_id)
+    
+    def get_session_id(self, connection_id: str) -> Optional[str]:
+        """Session ID mapped to a connection, if one was started"""
+        conn = self.connections.get(connection_id)
+        return conn.session_id if conn is not None else None
     
     async def send_message(self, connection_id: str, message: dict):
-        """Send message to specific connection"""
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
+        """Queue message for a specific connection without waiting for it to be written"""
+        conn = self.connections.get(connection_id)
+        if conn is not None:
+            conn.queue.put_nowait(message)
+    
+    async def _writer(self, connection_id: str, conn: Connection):
+        """Write queued messages in order, coalescing any backlog into one batch frame"""
+        websocket, queue = conn.websocket, conn.queue
+        closing = False
+        while not closing:
+            message = await queue.get()
+            if message is None:
+                return
+            
+            messages = [message]
+            while len(messages) < WRITER_BATCH_MAX and not queue.empty():
+                message = queue.get_nowait()
+                if message is None:
+                    closing = True
+                    break
+                messages.append(message)
+            frame = messages[0] if len(messages) == 1 else {"type": "batch", "data": messages}
+            
             try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_text(json.dumps(message))
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    return
+                await websocket.send_text(orjson.dumps(frame).decode())
             except Exception as e:
-                logger.error(f"Failed to send message to connection {connection_id}: {e}")
-                self.disconnect(connection_id)
+                logger.error("Failed to send message to connection %s: %s", connection_id, e)
+                self.disconnect(connection_id, conn)
+                return
+    
+    async def send_batch(self, connection_id: str, events: List[dict]):
+        """Queue events that belong to the same step; the writer sends them in one frame"""
+        conn = self.connections.get(connection_id)
+        if conn is not None:
+            for event in events:
+                conn.queue.put_nowait(event)
     
     async def send_to_all(self, message: dict):
         """Send message to all connected sessions"""
-        for connection_id in list(self.active_connections.keys()):
+        for connection_id in list(self.connections):
             await self.send_message(connection_id, message)
 
 # Global connection manager
 manager = ConnectionManager()
 
+def reports_errors(action: str):
+    """Wrap a message handler so any failure is logged and sent to the client as an error event"""
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(connection_id: str, data: dict):
+            try:
+                await handler(connection_id, data)
+            except Exception as e:
+                logger.error("Failed to %s: %s", action, e)
+                await manager.send_message(connection_id, error_event(f"Failed to {action}: {e}"))
+        return wrapper
+    return decorator
+
 @websocket_router.websocket("/ws/{connection_id}")
 async def websocket_endpoint(websocket: WebSocket, connection_id: str):
     """Main WebSocket endpoint for session communication"""
-    await manager.connect(websocket, connection_id)
+    conn = await manager.connect(websocket, connection_id)
     
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+            # Receive message from client; orjson parses binary frames without a decode
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            raw = frame["bytes"] if frame.get("bytes") is not None else frame.get("text")
+            if not raw:
+                await manager.send_message(connection_id, ERROR_INVALID_DATA)
+                continue
+            
+            # Reject oversized frames before parsing them; the server's ws_max_size
+            # enforces the same limit at the protocol level. Text frames are measured
+            # in UTF-8 bytes, not characters
+            if isinstance(raw, str):
+                raw = raw.encode()
+            if len(raw) > config.WS_MAX_MESSAGE_BYTES:
+                await manager.send_message(connection_id, ERROR_MESSAGE_TOO_LARGE)
+                continue
+            
+            try:
+                message_data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                await manager.send_message(connection_id, ERROR_INVALID_DATA)
+                continue
+            if not isinstance(message_data, dict):
+                await manager.send_message(connection_id, ERROR_INVALID_DATA)
+                continue
             
             message_type = message_data.get("type", "")
             
             # Handle different message types
-            if message_type == "ping":
-                await handle_ping(connection_id, message_data)
-            elif message_type == "start_session":
-                await handle_start_session(connection_id, message_data)
-            elif message_type == "user_message":
-                await handle_user_message(connection_id, message_data)
+            handler = MESSAGE_HANDLERS.get(message_type)
+            if handler is not None:
+                await handler(connection_id, message_data)
             else:
-                await manager.send_message(connection_id, {
-                    "type": "error",
-                    "data": {"message": f"Unknown message type: {message_type}"}
-                })
+                await manager.send_message(connection_id, error_event(f"Unknown message type: {message_type}"))
                 
     except WebSocketDisconnect:
-        manager.disconnect(connection_id)
+        manager.disconnect(connection_id, conn)
     except Exception as e:
-        logger.error(f"WebSocket error for connection {connection_id}: {e}")
-        await manager.send_message(connection_id, {
-            "type": "error",
-            "data": {"message": f"WebSocket error: {str(e)}"}
-        })
-        manager.disconnect(connection_id)
+        logger.error("WebSocket error for connection %s: %s", connection_id, e)
+        conn.queue.put_nowait(error_event(f"WebSocket error: {e}"))
+        manager.disconnect(connection_id, conn)
 
 async def handle_ping(connection_id: str, data: dict):
     """Handle ping messages"""
-    logger.debug(f"Received ping from connection {connection_id}")
+    logger.debug("Received ping from connection %s", connection_id)
     await manager.send_message(connection_id, {
         "type": "pong",
         "data": {"timestamp": datetime.now().isoformat()}
     })
 
+@reports_errors("start session")
 async def handle_start_session(connection_id: str, data: dict):
     """Handle session start requests"""
-    try:
-        logger.info(f"Received start_session request for connection {connection_id}: {data}")
-        
-        # Validate input data
-        if not isinstance(data, dict):
-            await manager.send_message(connection_id, {
-                "type": "error",
-                "data": {"message": "Invalid data format received"}
-            })
-            return
-            
-        candidate_name = data.get("data", {}).get("candidate_name", "Candidate")
-        
-        # Create new session using session manager
-        new_session_id, interviewer = session_manager.create_session()
-        
-        # Map connection ID to session ID
-        manager.map_session_id(connection_id, new_session_id)
-        
-        # Initialize interview state
-        interviewer.stage = "questioning"
-        interviewer.current_question = interviewer.questions[0]
-        interviewer.questions_asked = 1
-        
-        # Save initial state
-        session_manager.save_session(new_session_id)
+    logger.debug("Received start_session request for connection %s: %s", connection_id, data)
+    
+    # Validate input data
+    if not isinstance(data, dict):
+        await manager.send_message(connection_id, ERROR_INVALID_DATA)
+        return
         
-        welcome = """Welcome to your AI-driven Data Structures & Algorithms interview!
+    candidate_name = data.get("data", {}).get("candidate_name", "Candidate")
+    
+    # Create new session using session manager
+    new_session_id, interviewer = session_manager.create_session()
+    
+    # Map connection ID to session ID
+    manager.map_session_id(connection_id, new_session_id)
+    
+    # Initialize interview state
+    interviewer.stage = "questioning"
+    interviewer.current_question = interviewer.questions[0]
+    interviewer.questions_asked = 1
+    
+    # Save initial state
+    session_manager.save_session(new_session_id)
+    
+    logger.info("Started session %s for candidate: %s", new_session_id, candidate_name)
+    
+    await manager.send_message(connection_id, {
+        "type": "session_started",
+        "data": {
+            "session_id": new_session_id,
+            "welcome": WELCOME_JSON,
+            "first_question": QUESTION_JSON[0],
+            "candidate_name": candidate_name
+        }
+    })
 
-🧠 Powered by Advanced AI:
-- Dynamic feedback tailored to your specific answers  
-- Smart follow-up questions based on your performance
-- Intelligent conversation that adapts to your responses
+@reports_errors("process message")
+async def handle_user_message(connection_id: str, data: dict):
+    """Handle user messages with enhanced error handling and logging"""
+    logger.debug("Received user message for connection %s: %s", connection_id, data)
+    
+    # Get actual session ID from connection mapping
+    session_id = manager.get_session_id(connection_id)
+    if not session_id:
+        await manager.send_message(connection_id, ERROR_NO_SESSION_STARTED)
+        return
+    
+    # Validate input data
+    if not isinstance(data, dict):
+        await manager.send_message(connection_id, ERROR_INVALID_DATA)
+        return
+        
+    message = data.get("data", {}).get("message", "")
+    
+    if not message or not message.strip():
+        await manager.send_message(connection_id, ERROR_EMPTY_MESSAGE)
+        return
+    
+    # Get session using session manager
+    interviewer = session_manager.get_session(session_id)
+    if not interviewer:
+        await manager.send_message(connection_id, ERROR_SESSION_NOT_FOUND)
+        return
+    
+    logger.info("Processing message for session %s: %d characters", session_id, len(message))
+    
+    # Process message based on current stage
+    stage_handler = STAGE_HANDLERS.get(interviewer.stage)
+    if stage_handler is not None:
+        await stage_handler(connection_id, session_id, interviewer, message)
+    
+    # Save session state
+    session_manager.save_session(session_id)
 
-📋 Interview Format:
-- 5 DSA questions covering core concepts
-- AI analyzes each answer for technical accuracy and depth
-- Personalized feedback with improvement suggestions
-- Up to 2 follow-up questions per topic to deepen understanding
-- Comprehensive AI-generated performance summary
+# Inbound message type -> handler
+MESSAGE_HANDLERS = {
+    "ping": handle_ping,
+    "start_session": handle_start_session,
+    "user_message": handle_user_message,
+}
 
-Ready to begin? Let's start this intelligent interview experience!"""
-        
-        first_question = {
-            "id": interviewer.questions[0]['id'],
-            "question": interviewer.questions[0]['question'],
-            "difficulty": interviewer.questions[0]['difficulty'],
-            "key_concepts": interviewer.questions[0]['key_concepts']
+async def process_greeting_with_events(connection_id: str, session_id: str, interviewer: LLMPoweredInterviewer, message: str):
+    """Reply to the greeting by sending the first question"""
+    await interviewer.process_greeting(message)
+    await manager.send_message(connection_id, {
+        "type": "next_question",
+        "data": {
+            "session_id": session_id,
+            "question": QUESTION_JSON[interviewer.current_question_idx]
         }
-        
-        logger.info(f"Started session {new_session_id} for candidate: {candidate_name}")
-        
+    })
+
+def feedback_streamer(connection_id: str, session_id: str):
+    """Build a callback that forwards streamed feedback tokens to the client"""
+    async def send_chunk(chunk: str):
         await manager.send_message(connection_id, {
-            "type": "session_started",
+            "type": "feedback_chunk",
             "data": {
-                "session_id": new_session_id,
-                "welcome": welcome,
-                "first_question": first_question,
-                "candidate_name": candidate_name
+                "session_id": session_id,
+                "chunk": chunk
             }
         })
-        
-    except Exception as e:
-        logger.error(f"Failed to start session: {e}")
-        await manager.send_message(connection_id, {
-            "type": "error",
-            "data": {"message": f"Failed to start session: {str(e)}"}
-        })
-
-async def handle_user_message(connection_id: str, data: dict):
-    """Handle user messages with enhanced error handling and logging"""
-    try:
-        logger.info(f"Received user message for connection {connection_id}: {data}")
-        
-        # Get actual session ID from connection mapping
-        session_id = manager.session_id_mapping.get(connection_id)
-        if not session_id:
-            await manager.send_message(connection_id, {
-                "type": "error",
-                "data": {"message": "Session not found. Please start a new session."}
-            })
-            return
-        
-        # Validate input data
-        if not isinstance(data, dict):
-            await manager.send_message(connection_id, {
-                "type": "error",
-                "data": {"message": "Invalid data format received"}
-            })
-            return
-            
-        message = data.get("data", {}).get("message", "")
-        
-        if not message or not message.strip():
-            await manager.send_message(connection_id, {
-                "type": "error",
-                "data": {"message": "Message is required and cannot be empty"}
-            })
-            return
-        
-        # Get session using session manager
-        interviewer = session_manager.get_session(session_id)
-        if not interviewer:
-            await manager.send_message(connection_id, {
-                "type": "error",
-                "data": {"message": "Session not found"}
-            })
-            return
-        
-        logger.info(f"Processing message for session {session_id}: {len(message)} characters")
-        
-        # Send typing indicator
-        await manager.send_message(connection_id, {
-            "type": "bot_typing",
-            "data": {"session_id": session_id}
-        })
-        
-        # Process message based on current stage
-        if interviewer.stage == "greeting":
-            response = await interviewer.process_greeting(message)
-            await manager.send_message(connection_id, {
-                "type": "next_question",
-                "data": {
-                    "session_id": session_id,
-                    "question": {
-                        "id": interviewer.current_question['id'],
-                        "question": interviewer.current_question['question'],
-                        "difficulty": interviewer.current_question['difficulty'],
-                        "key_concepts": interviewer.current_question['key_concepts']
-                    }
-                }
-            })
-        elif interviewer.stage == "questioning":
-            await process_answer_with_events(connection_id, session_id, interviewer, message)
-        elif interviewer.stage == "following_up":
-            await process_followup_with_events(connection_id, session_id, interviewer, message)
-        
-        # Save session state
-        session_manager.save_session(session_id)
-        
-    except Exception as e:
-        logger.error(f"Failed to process user message: {e}")
-        await manager.send_message(connection_id, {
-            "type": "error",
-            "data": {"message": f"Failed to process message: {str(e)}"}
-        })
+    return send_chunk
 
 async def process_answer_with_events(connection_id: str, session_id: str, interviewer: LLMPoweredInterviewer, message: str):
     """Process answer with real-time WebSocket events"""
-    logger.info(f"Processing answer for session {session_id}: {message[:50]}...")
+    logger.info("Processing answer for session %s: %s...", session_id, message[:50])
     current_q = interviewer.current_question
     
-    analysis = await interviewer.analyze_answer_with_llm(
-        current_q['question'], 
-        message, 
-        current_q['key_concepts']
-    )
+    # The follow-up only depends on the analysis, so generate it while feedback streams
+    followup_task = None
     
-    logger.info(f"Emitting analysis for session {session_id}, score: {analysis['score']}")
-    await manager.send_message(connection_id, {
-        "type": "analysis",
-        "data": {
-            "session_id": session_id,
-            "analysis": analysis
-        }
-    })
+    async def on_analysis(analysis):
+        nonlocal followup_task
+        logger.info("Emitting analysis for session %s, score: %s", session_id, analysis['score'])
+        await manager.send_message(connection_id, {
+            "type": "analysis",
+            "data": {
+                "session_id": session_id,
+                "analysis": analysis
+            }
+        })
+        
+        should_followup = interviewer.should_ask_followup(analysis['score'])
+        
+        logger.info("Follow-up decision: %s, score: %s, followup_count: %s, max_followups: %s", should_followup, analysis['score'], interviewer.current_followup_count, interviewer.max_followups)
+        
+        if should_followup and interviewer.current_followup_count < interviewer.max_followups:
+            logger.info("Generating follow-up question for score %s", analysis['score'])
+            followup_task = asyncio.create_task(interviewer.generate_followup_question_llm(
+                current_q['question'],
+                message,
+                current_q['key_concepts'],
+                analysis['raw_analysis']
+            ))
     
-    feedback = await interviewer.generate_feedback_with_llm(
+    analysis, feedback = await interviewer.assess_answer_with_llm(
         current_q['question'],
         message,
-        analysis['raw_analysis'],
-        analysis['score'],
-        interviewer.current_question_idx
+        current_q['key_concepts'],
+        on_analysis=on_analysis,
+        on_chunk=feedback_streamer(connection_id, session_id)
     )
     
-    logger.info(f"Emitting feedback for session {session_id}")
-    await manager.send_message(connection_id, {
+    # The final feedback goes out in the same frame as whatever comes next
+    logger.info("Emitting feedback for session %s", session_id)
+    events = [{
         "type": "feedback",
         "data": {
             "session_id": session_id,
             "feedback": feedback
         }
-    })
+    }]
     
-    interviewer.performance_data.append({
-        "question_id": current_q['id'],
-        "question": current_q['question'],
-        "answer": message,
-        "analysis": analysis,
-        "feedback": feedback,
-        "timestamp": datetime.now().isoformat(),
-        "is_followup": False
-    })
+    interviewer.record_performance(TurnRecord(
+        question_id=current_q['id'],
+        question=current_q['question'],
+        answer=message,
+        analysis=analysis,
+        feedback=feedback,
+        is_followup=False
+    ))
     
     interviewer.conversation_history.append({"role": "user", "content": message})
     interviewer.conversation_history.append({"role": "assistant", "content": feedback})
     
-    should_followup = await interviewer.should_ask_followup_llm(
-        current_q['question'],
-        message,
-        analysis['score'],
-        analysis['raw_analysis']
-    )
-    
-    logger.info(f"Follow-up decision: {should_followup}, score: {analysis['score']}, followup_count: {interviewer.current_followup_count}, max_followups: {interviewer.max_followups}")
-    
-    if should_followup and interviewer.current_followup_count < interviewer.max_followups:
-        logger.info(f"Generating follow-up question for score {analysis['score']}")
+    if followup_task is not None:
         interviewer.stage = "following_up"
         interviewer.current_followup_count += 1
-        followup_q = await interviewer.generate_followup_question_llm(
-            current_q['question'],
-            message,
-            current_q['key_concepts'],
-            analysis['raw_analysis']
-        )
+        followup_q = await followup_task
         
-        logger.info(f"Emitting follow-up question: {followup_q[:50]}...")
-        await manager.send_message(connection_id, {
+        logger.info("Emitting follow-up question: %s...", followup_q[:50])
+        events.append({
             "type": "followup_question",
             "data": {
                 "session_id": session_id,
@@ -349,83 +409,80 @@ async def process_answer_with_events(connection_id: str, session_id: str, interv
                 }
             }
         })
+        await manager.send_batch(connection_id, events)
         
         interviewer.conversation_history.append({"role": "assistant", "content": followup_q})
     else:
         interviewer.current_followup_count = 0
-        logger.info(f"Good score ({analysis['score']}) - moving to next question")
-        # Give frontend time to display analysis before moving to next question
-        await asyncio.sleep(3)
-        await move_to_next_question(connection_id, session_id, interviewer)
+        logger.info("Good score (%s) - moving to next question", analysis['score'])
+        await move_to_next_question(connection_id, session_id, interviewer, ANALYSIS_DISPLAY_MS, events)
 
 async def process_followup_with_events(connection_id: str, session_id: str, interviewer: LLMPoweredInterviewer, message: str):
     """Process follow-up answer with real-time WebSocket events"""
-    logger.info(f"Processing follow-up for session {session_id}: {message[:50]}...")
+    logger.info("Processing follow-up for session %s: %s...", session_id, message[:50])
     current_q = interviewer.current_question
+    followup_text = current_q['follow_ups'][interviewer.current_followup_count - 1]
     
-    analysis = await interviewer.analyze_answer_with_llm(
-        current_q['follow_ups'][interviewer.current_followup_count - 1],
-        message,
-        current_q['key_concepts']
-    )
+    # The follow-up only depends on the analysis, so generate it while feedback streams
+    followup_task = None
     
-    await manager.send_message(connection_id, {
-        "type": "analysis",
-        "data": {
-            "session_id": session_id,
-            "analysis": analysis
-        }
-    })
+    async def on_analysis(analysis):
+        nonlocal followup_task
+        await manager.send_message(connection_id, {
+            "type": "analysis",
+            "data": {
+                "session_id": session_id,
+                "analysis": analysis
+            }
+        })
+        
+        should_followup = interviewer.should_ask_followup(analysis['score'])
+        
+        logger.info("Follow-up processing - Should followup? %s, score: %s, followup_count: %s, max_followups: %s", should_followup, analysis['score'], interviewer.current_followup_count, interviewer.max_followups)
+        
+        if should_followup and interviewer.current_followup_count < interviewer.max_followups:
+            followup_task = asyncio.create_task(interviewer.generate_followup_question_llm(
+                current_q['question'],
+                message,
+                current_q['key_concepts'],
+                analysis['raw_analysis']
+            ))
     
-    feedback = await interviewer.generate_feedback_with_llm(
-        current_q['follow_ups'][interviewer.current_followup_count - 1],
+    analysis, feedback = await interviewer.assess_answer_with_llm(
+        followup_text,
         message,
-        analysis['raw_analysis'],
-        analysis['score'],
-        interviewer.current_question_idx
+        current_q['key_concepts'],
+        on_analysis=on_analysis,
+        on_chunk=feedback_streamer(connection_id, session_id)
     )
     
-    await manager.send_message(connection_id, {
+    # The final feedback goes out in the same frame as whatever comes next
+    events = [{
         "type": "feedback",
         "data": {
             "session_id": session_id,
             "feedback": feedback
         }
-    })
+    }]
     
-    interviewer.performance_data.append({
-        "question_id": current_q['id'],
-        "question": current_q['follow_ups'][interviewer.current_followup_count - 1],
-        "answer": message,
-        "analysis": analysis,
-        "feedback": feedback,
-        "timestamp": datetime.now().isoformat(),
-        "is_followup": True
-    })
+    interviewer.record_performance(TurnRecord(
+        question_id=current_q['id'],
+        question=followup_text,
+        answer=message,
+        analysis=analysis,
+        feedback=feedback,
+        is_followup=True
+    ))
     
     interviewer.conversation_history.append({"role": "user", "content": message})
     interviewer.conversation_history.append({"role": "assistant", "content": feedback})
     
-    should_followup = await interviewer.should_ask_followup_llm(
-        current_q['follow_ups'][interviewer.current_followup_count - 1],
-        message,
-        analysis['score'],
-        analysis['raw_analysis']
-    )
-    
-    logger.info(f"Follow-up processing - Should followup? {should_followup}, score: {analysis['score']}, followup_count: {interviewer.current_followup_count}, max_followups: {interviewer.max_followups}")
-    
-    if should_followup and interviewer.current_followup_count < interviewer.max_followups:
+    if followup_task is not None:
         interviewer.current_followup_count += 1
-        followup_q = await interviewer.generate_followup_question_llm(
-            current_q['question'],
-            message,
-            current_q['key_concepts'],
-            analysis['raw_analysis']
-        )
+        followup_q = await followup_task
         
-        logger.info(f"Emitting follow-up question: {followup_q[:50]}...")
-        await manager.send_message(connection_id, {
+        logger.info("Emitting follow-up question: %s...", followup_q[:50])
+        events.append({
             "type": "followup_question",
             "data": {
                 "session_id": session_id,
@@ -435,29 +492,41 @@ async def process_followup_with_events(connection_id: str, session_id: str, inte
                 }
             }
         })
+        await manager.send_batch(connection_id, events)
         
         interviewer.conversation_history.append({"role": "assistant", "content": followup_q})
     else:
         interviewer.current_followup_count = 0
         logger.info("No follow-up needed, moving to next question")
-        # Give frontend time to display analysis before moving to next question
-        await asyncio.sleep(3)
-        await move_to_next_question(connection_id, session_id, interviewer)
+        await move_to_next_question(connection_id, session_id, interviewer, ANALYSIS_DISPLAY_MS, events)
+
+# Interview stage -> handler for the candidate's message in that stage
+STAGE_HANDLERS = {
+    "greeting": process_greeting_with_events,
+    "questioning": process_answer_with_events,
+    "following_up": process_followup_with_events,
+}
 
-async def move_to_next_question(connection_id: str, session_id: str, interviewer: LLMPoweredInterviewer):
-    """Move to the next question or end interview"""
+async def move_to_next_question(connection_id: str, session_id: str, interviewer: LLMPoweredInterviewer, display_after_ms: int = 0, pending: Optional[List[dict]] = None):
+    """Move to the next question or end interview; the client waits display_after_ms before showing it.
+    
+    Events in pending are sent in the same frame as the next question; the summary
+    needs another LLM call, so they are flushed ahead of it instead.
+    """
     interviewer.current_question_idx += 1
     interviewer.stage = "questioning"
     interviewer.current_followup_count = 0
     
     if interviewer.current_question_idx >= len(interviewer.questions):
-        logger.info(f"Interview completed for session {session_id}")
+        logger.info("Interview completed for session %s", session_id)
+        await manager.send_batch(connection_id, pending or [])
         summary = await interviewer.end_interview()
         await manager.send_message(connection_id, {
             "type": "interview_summary",
             "data": {
                 "session_id": session_id,
-                "summary": summary
+                "summary": summary,
+                "display_after_ms": display_after_ms
             }
         })
         return
@@ -465,16 +534,12 @@ async def move_to_next_question(connection_id: str, session_id: str, interviewer
     interviewer.current_question = interviewer.questions[interviewer.current_question_idx]
     interviewer.questions_asked += 1
     
-    logger.info(f"Moving to question {interviewer.questions_asked} for session {session_id}")
-    await manager.send_message(connection_id, {
+    logger.info("Moving to question %s for session %s", interviewer.questions_asked, session_id)
+    await manager.send_batch(connection_id, [*(pending or []), {
         "type": "next_question",
         "data": {
             "session_id": session_id,
-            "question": {
-                "id": interviewer.current_question['id'],
-                "question": interviewer.current_question['question'],
-                "difficulty": interviewer.current_question['difficulty'],
-                "key_concepts": interviewer.current_question['key_concepts']
-            }
+            "question": QUESTION_JSON[interviewer.current_question_idx],
+            "display_after_ms": display_after_ms
         }
-    })
+    }])
@@ -11,4 +11,4 @@ fi
 pip install -r requirements.txt
 
 # Run the FastAPI application with uvicorn
-uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload --ws-max-size "${WS_MAX_MESSAGE_BYTES:-65536}"
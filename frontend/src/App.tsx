@@ -38,16 +38,17 @@ function App() {
       setQuestionsAnswered(1);
     });
 
-    socketService.on('bot_typing', () => {
-      setIsTyping(true);
-    });
-
     socketService.on('analysis', (data) => {
       console.log('📊 Received analysis:', data);
       setAnalysis(data.analysis);
       setIsTyping(false);
     });
 
+    // Feedback streams in as chunks; the final feedback event replaces the assembled text
+    socketService.on('feedback_chunk', (data) => {
+      setFeedback(prev => prev + data.chunk);
+    });
+
     socketService.on('feedback', (data) => {
       console.log('💬 Received feedback:', data);
       setFeedback(data.feedback);
@@ -55,10 +56,13 @@ function App() {
 
     socketService.on('next_question', (data) => {
       console.log('➡️ Received next_question:', data);
-      setCurrentQuestion(data.question);
-      setQuestionsAnswered(prev => prev + 1);
-      setAnalysis(null);
-      setFeedback('');
+      // The server sends this right after the analysis; hold it so the analysis stays readable
+      setTimeout(() => {
+        setCurrentQuestion(data.question);
+        setQuestionsAnswered(prev => prev + 1);
+        setAnalysis(null);
+        setFeedback('');
+      }, data.display_after_ms ?? 0);
     });
 
     socketService.on('followup_question', (data) => {
@@ -71,12 +75,15 @@ function App() {
 
     socketService.on('interview_summary', (data) => {
       console.log('📋 Received interview_summary:', data);
-      setInterviewSummary(data.summary);
-      setIsInterviewComplete(true);
+      setTimeout(() => {
+        setInterviewSummary(data.summary);
+        setIsInterviewComplete(true);
+      }, data.display_after_ms ?? 0);
     });
 
     socketService.on('error', (data) => {
       console.error('❌ Socket error:', data.message);
+      setIsTyping(false);
     });
 
     return () => {
@@ -91,6 +98,8 @@ function App() {
 
   const handleSendMessage = (message: string) => {
     if (sessionId) {
+      // Show the typing indicator right away; it clears when the analysis (or an error) arrives
+      setIsTyping(true);
       socketService.sendUserMessage(sessionId, message);
     }
   };
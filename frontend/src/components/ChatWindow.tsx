@@ -19,6 +19,7 @@ type ChatMessage = {
   timestamp: Date;
   analysis?: Analysis;
   questionData?: Question;
+  isFeedback?: boolean;
 };
 
 function AnalysisMessage({ msg }: { msg: ChatMessage }) {
@@ -187,18 +188,22 @@ export function ChatWindow({
     }
   }, [currentQuestion, lastQuestionId, lastQuestionContent]);
 
-  // Handle feedback
+  // Handle feedback: it streams in, so the turn's feedback message is updated in place
   useEffect(() => {
-    if (feedback && !hasAnalyzed) {
+    if (!feedback) return;
+    
+    setMessages(prev => {
+      const last = prev[prev.length - 1];
+      const streaming = last?.isFeedback === true;
       const feedbackMessage: ChatMessage = {
         type: 'bot',
         content: feedback,
-        timestamp: new Date()
+        timestamp: streaming ? last.timestamp : new Date(),
+        isFeedback: true
       };
-      
-      setMessages(prev => [...prev, feedbackMessage]);
-    }
-  }, [feedback, hasAnalyzed]);
+      return streaming ? [...prev.slice(0, -1), feedbackMessage] : [...prev, feedbackMessage];
+    });
+  }, [feedback]);
 
   // Handle analysis
   useEffect(() => {
@@ -100,6 +100,12 @@ class SocketService {
   }
 
   private handleMessage(message: WebSocketMessage): void {
+    // Events the server coalesced into one frame are dispatched in order
+    if (message.type === 'batch') {
+      (message.data as WebSocketMessage[]).forEach(event => this.handleMessage(event));
+      return;
+    }
+
     const handlers = this.messageHandlers.get(message.type);
     if (handlers) {
       handlers.forEach(handler => handler(message.data));
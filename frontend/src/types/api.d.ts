@@ -49,11 +49,11 @@ export interface InterviewSummary {
 export interface SocketEvents {
   connected: { message: string };
   session_started: StartSessionResponse;
-  bot_typing: { session_id: string };
   analysis: { session_id: string; analysis: Analysis };
+  feedback_chunk: { session_id: string; chunk: string };
   feedback: { session_id: string; feedback: string };
   followup_question: { session_id: string; question: Question };
-  next_question: { session_id: string; question: Question };
-  interview_summary: { session_id: string; summary: string };
+  next_question: { session_id: string; question: Question; display_after_ms?: number };
+  interview_summary: { session_id: string; summary: string; display_after_ms?: number };
   error: { message: string };
 }
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("chainlit")
+from langchain_community.llms.fake import FakeListLLM
+
+import main
+
+
+class CountingLLM(FakeListLLM):
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+    async def _acall(self, *args, **kwargs):
+        self.calls += 1
+        return await super()._acall(*args, **kwargs)
+
+
+def test_repeated_feedback_makes_no_second_llm_request(monkeypatch):
+    interviewer_cls = main.LLMPoweredInterviewer
+    llm = CountingLLM(responses=["FEEDBACK: Solid answer."])
+    monkeypatch.setattr(interviewer_cls, "feedback_chain", interviewer_cls.feedback_prompt | llm)
+    monkeypatch.setattr(interviewer_cls, "feedback_cache", main.OrderedDict())
+
+    interviewer = interviewer_cls()
+    chunks = []
+
+    async def on_chunk(chunk):
+        chunks.append(chunk)
+
+    async def run():
+        args = ("What is a stack?", "LIFO structure", "SCORE: 7", 7, 0)
+        first = await interviewer.generate_feedback_with_llm(*args, on_chunk=on_chunk)
+        second = await interviewer.generate_feedback_with_llm(*args, on_chunk=on_chunk)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second == "Solid answer."
+    assert llm.calls == 1
+    assert chunks[-1] == "Solid answer."